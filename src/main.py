@@ -1,11 +1,15 @@
 import argparse
-import os
 from pathlib import Path
 import sys
-import yaml
 import json
-import urllib.request
-from urllib.error import HTTPError, URLError
+from urllib.error import HTTPError
+
+from nuget_common import (
+    NUGET_INDEX_URL,
+    load_cached_service_index,
+    make_pool_manager,
+    save_cached_service_index,
+)
 
 CONFIG_DIR_NAME = ".config"
 TOOL_DIR_NAME = "dependency-tool"
@@ -13,6 +17,11 @@ CONFIG_FILE_NAME = "config.yaml"
 
 CONFIG_PATH = Path.home() / CONFIG_DIR_NAME / TOOL_DIR_NAME / CONFIG_FILE_NAME
 
+# yaml, urllib3 and orjson are imported on first use: `init` and `--help` need
+# none of them, and together they dominate interpreter startup for this tool.
+_http_pool = None
+_json_loads = None
+
 
 def initialize_config():
     config_file_path = CONFIG_PATH
@@ -49,33 +58,123 @@ def load_config():
         )
         return None
 
-    with open(config_path) as stream:
+    import yaml
+
+    # libyaml-backed loader when PyYAML was built with it, pure-Python otherwise.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    # One read, then libyaml parses the in-memory buffer instead of pulling
+    # chunks through Python file reads. `init` creates an empty file, which
+    # needs no parsing at all.
+    raw_config = config_path.read_bytes()
+
+    try:
+        config = None
+        if raw_config.strip():
+            config = yaml.load(raw_config, Loader=loader)
+
+        print("=== Current config ===")
+        if config:
+            for i, j in config.items():
+                print(f"{i}: {j}")
+        else:
+            print("(Config file is empty)")
+        print("=== END ===")
+        return config
+    except yaml.YAMLError as err:
+        print(err)
+        return None
+
+
+def json_loads(data):
+    """
+    Декодирует JSON через orjson, если он установлен, иначе через json.
+    """
+    global _json_loads
+    if _json_loads is None:
         try:
-            config = yaml.safe_load(stream)
-
-            print("=== Current config ===")
-            if config:
-                for i, j in config.items():
-                    print(f"{i}: {j}")
-            else:
-                print("(Config file is empty)")
-            print("=== END ===")
-            return config
-        except yaml.YAMLError as err:
-            print(err)
-            return None
+            import orjson
+
+            _json_loads = orjson.loads
+        except ImportError:
+            _json_loads = json.loads
+    return _json_loads(data)
+
+
+def get_http_pool():
+    """
+    Возвращает общий пул соединений urllib3, создавая его при первом вызове.
+    """
+    global _http_pool
+    if _http_pool is None:
+        _http_pool = make_pool_manager(num_pools=4, maxsize=20)
+    return _http_pool
+
+
+def fetch_json(url):
+    """
+    Выполняет GET через общий пул соединений и декодирует JSON-ответ.
+    """
+    response = get_http_pool().request("GET", url)
+    if response.status >= 400:
+        # Same exception urlopen used to raise, so e.code / e.reason keep working.
+        raise HTTPError(url, response.status, response.reason, response.headers, None)
+    return json_loads(response.data)
+
+
+def get_service_index():
+    """
+    Возвращает индекс сервисов NuGet V3, используя кэш на диске, пока он не устарел.
+    """
+    index_data = load_cached_service_index(json_loads)
+    if index_data is not None:
+        return index_data
+
+    print(f"Fetching NuGet service index...")
+    index_data = fetch_json(NUGET_INDEX_URL)
+    save_cached_service_index(index_data)
+    return index_data
+
+
+def find_catalog_entry(registrations_base_url, package_id_lower, package_version):
+    """
+    Ищет catalogEntry версии через индекс регистрации (запасной путь, если нет leaf).
+    Страницы, встроенные в индекс, используются без дополнительного запроса.
+    """
+    registration_url = f"{registrations_base_url}{package_id_lower}/index.json"
+    print(f"Fetching package registration index: {registration_url}")
+
+    registration_data = fetch_json(registration_url)
+
+    page = None
+    for candidate in registration_data["items"]:
+        if candidate.get("lower") <= package_version <= candidate.get("upper"):
+            page = candidate
+            break
+
+    if not page:
+        return None
+
+    page_items = page.get("items")
+    if page_items is None:
+        print(f"Fetching metadata page: {page['@id']}")
+        page_items = fetch_json(page["@id"]).get("items", [])
+
+    for item in page_items:
+        entry = item.get("catalogEntry", {})
+        if entry.get("version") == package_version:
+            return entry
+    return None
 
 
 def find_dependencies(package_name, package_version):
     """
     Получает и отображает прямые зависимости для указанной версии пакета NuGet.
     """
-    NUGET_INDEX_URL = "https://api.nuget.org/v3/index.json"
+    import urllib3
 
     try:
-        print(f"Fetching NuGet service index...")
-        with urllib.request.urlopen(NUGET_INDEX_URL) as response:
-            index_data = json.loads(response.read())
+        index_data = get_service_index()
 
         registrations_base_url = None
         for resource in index_data["resources"]:
@@ -91,39 +190,27 @@ def find_dependencies(package_name, package_version):
             return
 
         package_id_lower = package_name.lower()
-        registration_url = f"{registrations_base_url}{package_id_lower}/index.json"
-        print(f"Fetching package registration index: {registration_url}")
-
-        with urllib.request.urlopen(registration_url) as response:
-            registration_data = json.loads(response.read())
-
-        page_url = None
-        for page in registration_data["items"]:
-            if page.get("lower") <= package_version <= page.get("upper"):
-                page_url = page["@id"]
-                break
+        leaf_url = (
+            f"{registrations_base_url}{package_id_lower}/{package_version.lower()}.json"
+        )
+        print(f"Fetching registration leaf: {leaf_url}")
 
-        if not page_url:
-            print(
-                f"Error: Could not find package version {package_version} in registration index.",
-                file=sys.stderr,
+        try:
+            catalog_entry = fetch_json(leaf_url).get("catalogEntry")
+        except HTTPError as e:
+            if e.code != 404:
+                raise
+            catalog_entry = find_catalog_entry(
+                registrations_base_url, package_id_lower, package_version
             )
-            return
 
-        print(f"Fetching metadata page: {page_url}")
-        with urllib.request.urlopen(page_url) as response:
-            page_data = json.loads(response.read())
-
-        catalog_entry = None
-        for item in page_data.get("items", []):
-            entry = item.get("catalogEntry", {})
-            if entry.get("version") == package_version:
-                catalog_entry = entry
-                break
+        if isinstance(catalog_entry, str):
+            print(f"Fetching catalog entry: {catalog_entry}")
+            catalog_entry = fetch_json(catalog_entry)
 
         if not catalog_entry:
             print(
-                f"Error: Could not find catalog entry for version {package_version} in metadata page.",
+                f"Error: Could not find catalog entry for version {package_version}.",
                 file=sys.stderr,
             )
             return
@@ -160,8 +247,8 @@ def find_dependencies(package_name, package_version):
                 f"Package '{package_name}' or version '{package_version}' not found.",
                 file=sys.stderr,
             )
-    except URLError as e:
-        print(f"Error: Could not reach NuGet server: {e.reason}", file=sys.stderr)
+    except urllib3.exceptions.HTTPError as e:
+        print(f"Error: Could not reach NuGet server: {e}", file=sys.stderr)
     except json.JSONDecodeError:
         print(
             "Error: Failed to parse JSON response from NuGet server.", file=sys.stderr
@@ -177,7 +264,7 @@ def main():
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
-    parser_init = subparsers.add_parser(
+    subparsers.add_parser(
         "init", help="Initializes the configuration directory and file."
     )
 
@@ -0,0 +1,87 @@
+"""
+Pieces shared by main.py and parser.py. Only the standard library is imported
+here, so the CLI can use it without paying for urllib3 or orjson at startup.
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+NUGET_INDEX_URL = "https://api.nuget.org/v3/index.json"
+
+CACHE_DIR = Path.home() / ".config" / "dependency-tool"
+SERVICE_INDEX_CACHE_PATH = CACHE_DIR / "nuget-index.json"
+SERVICE_INDEX_TTL = 24 * 60 * 60  # seconds
+
+
+def load_cached_service_index(loads=json.loads):
+    """
+    Load the service index from disk if the cached copy is younger than the TTL.
+
+    :param loads: JSON decoder for the file contents (bytes).
+    :return: The service index, or None if there is no usable copy.
+    """
+    try:
+        age = time.time() - SERVICE_INDEX_CACHE_PATH.stat().st_mtime
+        if age > SERVICE_INDEX_TTL:
+            return None
+        return loads(SERVICE_INDEX_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_service_index(service_index):
+    """
+    Persist the service index to disk; a failed write only costs a refetch later.
+
+    Each writer gets its own temp file, so concurrent runs never interleave
+    their writes before the atomic replace.
+    """
+    cache_dir = SERVICE_INDEX_CACHE_PATH.parent
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=cache_dir, prefix=SERVICE_INDEX_CACHE_PATH.name, suffix=".tmp"
+        )
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(service_index, f)
+        os.replace(tmp_path, SERVICE_INDEX_CACHE_PATH)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def make_pool_manager(headers=None, **pool_kwargs):
+    """
+    Build the urllib3 PoolManager both entry points use for NuGet traffic.
+
+    The pool advertises every encoding urllib3 can decode here (gzip, deflate,
+    plus br/zstd when brotli / zstandard are installed) and retries throttling
+    and transient server errors with exponential backoff, waiting out
+    Retry-After when NuGet sends it. urllib3 is imported on call, so importing
+    this module stays cheap.
+
+    :param headers: Extra default headers, merged over Accept-Encoding.
+    :param pool_kwargs: Passed through to urllib3.PoolManager.
+    """
+    import urllib3
+
+    return urllib3.PoolManager(
+        headers={**urllib3.util.make_headers(accept_encoding=True), **(headers or {})},
+        retries=urllib3.util.Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(408, 429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+        ),
+        **pool_kwargs,
+    )
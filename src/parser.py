@@ -1,18 +1,245 @@
-import requests
+import urllib3
+import atexit
+import dbm
+import functools
 import json
+import logging
 import re
-from urllib.parse import urlencode
-from collections import deque
+import shelve
+import sys
+import threading
+import time
+from urllib.parse import quote_plus, urlencode
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from nuget_common import (
+    CACHE_DIR,
+    NUGET_INDEX_URL,
+    load_cached_service_index,
+    make_pool_manager,
+    save_cached_service_index,
+)
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_PATH = CACHE_DIR / "http-cache"
+HTTP_CACHE_TTL = 24 * 60 * 60  # seconds a cached response is used without revalidation
+NEVER_EXPIRES = float("inf")
+
+CONNECT_TIMEOUT = 3.05  # seconds
+REQUEST_TIMEOUT = 30  # seconds
+
+# All traffic goes to api.nuget.org, so the worker count is also the per-host
+# concurrency cap; keep it well under NuGet's MaxConnectionsPerServer guidance.
+MAX_WORKERS = 10
+# Registration pages get their own pool: get_package_versions already runs on
+# _EXECUTOR workers, and waiting on the same pool from inside it can deadlock.
+MAX_PAGE_WORKERS = 8
+
+CATALOG_MAP_CACHE_SIZE = 2048  # packages whose version maps stay in memory
+
+# One keep-alive pool for the whole process: every NuGet call reuses pooled
+# TCP/TLS connections instead of handshaking per request. Each worker thread
+# can hold its own connection, and block=True makes any extra caller wait for
+# a pooled one rather than open a throwaway connection, so the number of
+# sockets to a host never exceeds maxsize.
+# Compression and the retry policy come from make_pool_manager.
+_POOL = make_pool_manager(
+    num_pools=2,
+    maxsize=MAX_WORKERS + MAX_PAGE_WORKERS,
+    block=True,
+    headers={"Accept": "application/json", "User-Agent": "dependency-tool/0.1"},
+    timeout=urllib3.Timeout(connect=CONNECT_TIMEOUT, read=REQUEST_TIMEOUT),
+)
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+_PAGE_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS)
+
+_search_url_template = None
+
+# url -> (etag, last_modified, body, stored_at). Opened lazily; False once
+# opening has failed.
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+# A direct dependency of a package version; tuple-backed, so one small object
+# per edge instead of a dict.
+Dep = namedtuple("Dep", "framework id range")
+
+# One version from a registration index: the version as NuGet spells it, its
+# catalog URL (or None), and its dependencies when the index inlines the
+# catalog entry (otherwise None, and they are fetched from the leaf).
+_Leaf = namedtuple("_Leaf", "version catalog_url dependencies")
+
+# package_id_lower -> {version_lower: _Leaf}, filled by _version_catalog_map and
+# kept in LRU order up to CATALOG_MAP_CACHE_SIZE packages. Hand-rolled rather
+# than lru_cache so dependency lookups can peek at an already-read index
+# without triggering the walk.
+_catalog_maps = OrderedDict()
+_catalog_maps_lock = threading.Lock()
+
+# original id/version -> interned lowercase form, so each distinct string is
+# lowered once per process however often the graph walks meet it.
+_lower_cache = {}
+
+_VERSION_RE = re.compile(r"^(\d+(?:\.\d+)*)(?:-([^+]+))?(?:\+(.*))?$")
+
+
+def close_pool():
+    """
+    Close all pooled connections; the pool reconnects on the next request.
+    """
+    _POOL.clear()
+
+
+class HTTPStatusError(urllib3.exceptions.HTTPError):
+    """
+    Raised when the NuGet API answers with an error status code.
+    """
+
+    def __init__(self, url, status):
+        super().__init__(f"{status} Error for url: {url}")
+        self.url = url
+        self.status = status
+
+
+def _open_http_cache():
+    """
+    Open the on-disk response cache; returns None if it cannot be used.
+    """
+    global _http_cache
+    if _http_cache is None:
+        try:
+            HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            _http_cache = shelve.open(str(HTTP_CACHE_PATH))
+            atexit.register(_http_cache.close)
+        except dbm.error:
+            _http_cache = False
+    return _http_cache if _http_cache is not False else None
+
+
+def _cached_response(url):
+    """
+    Return the cached (etag, last_modified, body, stored_at) for url, or None.
+    An entry that cannot be read back in that shape counts as a miss.
+    """
+    with _http_cache_lock:
+        cache = _open_http_cache()
+        if cache is None:
+            return None
+        try:
+            etag, last_modified, body, stored_at = cache[url]
+        except Exception:  # missing, unpicklable or of another shape
+            return None
+    return etag, last_modified, body, stored_at
+
+
+def _store_response(url, etag, last_modified, body):
+    global _http_cache
+    with _http_cache_lock:
+        cache = _open_http_cache()
+        if cache is not None:
+            try:
+                cache[url] = (etag, last_modified, body, time.time())
+            except dbm.error:
+                # Full disk or an oversized value: a failed write only costs a
+                # refetch later, so stop using the cache for this process.
+                _http_cache = False
+
+
+def _drop_response(url):
+    global _http_cache
+    with _http_cache_lock:
+        cache = _open_http_cache()
+        if cache is not None:
+            try:
+                cache.pop(url, None)
+            except dbm.error:
+                _http_cache = False
+
+
+def _get_json(url, max_age=HTTP_CACHE_TTL):
+    """
+    GET a URL through the shared pool and decode the JSON body.
+
+    Responses are cached on disk. A cached copy younger than max_age seconds
+    is used without touching the network (NEVER_EXPIRES for immutable
+    documents such as registration leaves and catalog entries); an older one
+    is revalidated with If-None-Match / If-Modified-Since, so an unchanged
+    document costs a bodiless 304. Only bodies that decode are stored, and a
+    cached one that no longer decodes is dropped rather than served again.
+    """
+    cached = _cached_response(url)
+    headers = _POOL.headers
+    if cached is not None:
+        etag, last_modified, body, stored_at = cached
+        if time.time() - stored_at < max_age:
+            try:
+                return _loads(body)
+            except ValueError:
+                _drop_response(url)
+                cached = None
+
+    if cached is not None:
+        validators = {}
+        if etag:
+            validators["If-None-Match"] = etag
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+        if validators:
+            headers = {**headers, **validators}
+
+    response = _POOL.request("GET", url, headers=headers)
+    if response.status == 304 and cached is not None:
+        try:
+            data = _loads(body)
+        except ValueError:
+            _drop_response(url)
+            raise
+        _store_response(
+            url,
+            response.headers.get("ETag", etag),
+            response.headers.get("Last-Modified", last_modified),
+            body,
+        )
+        return data
+    if response.status >= 400:
+        raise HTTPStatusError(url, response.status)
 
+    # Decode before caching: an error page or truncated body sent with a 200
+    # raises here and is never stored.
+    data = _loads(response.data)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified or max_age > 0:
+        _store_response(url, etag, last_modified, response.data)
+    return data
 
+
+@functools.lru_cache(maxsize=1)
 def get_nuget_service_index():
     """
     Fetch the NuGet V3 service index.
+
+    The index is fetched at most once per process and is reused from disk
+    for SERVICE_INDEX_TTL seconds across runs.
     """
-    url = "https://api.nuget.org/v3/index.json"
-    response = requests.get(url)
-    response.raise_for_status()
-    return response.json()
+    service_index = load_cached_service_index(_loads)
+    if service_index is not None:
+        return service_index
+
+    # The index has its own TTL file, so here it is only revalidated.
+    service_index = _get_json(NUGET_INDEX_URL, max_age=0)
+    save_cached_service_index(service_index)
+    return service_index
 
 
 def find_resource_url(service_index, resource_type):
@@ -25,6 +252,25 @@ def find_resource_url(service_index, resource_type):
     raise ValueError(f"Resource type '{resource_type}' not found.")
 
 
+@functools.lru_cache(maxsize=16)
+def _resource_url(resource_type):
+    """
+    Resolve a resource URL from the process-wide service index, once per type.
+    """
+    return find_resource_url(get_nuget_service_index(), resource_type)
+
+
+def _search_template():
+    """
+    Build the SearchQueryService URL template once per process.
+    """
+    global _search_url_template
+    if _search_url_template is None:
+        search_url = _resource_url("SearchQueryService")
+        _search_url_template = search_url + "?q={q}&take={take}&skip={skip}"
+    return _search_url_template
+
+
 def search_packages(query, take=10, skip=0):
     """
     Search for packages using the NuGet SearchQueryService.
@@ -34,59 +280,142 @@ def search_packages(query, take=10, skip=0):
     :param skip: Number of results to skip (for pagination).
     :return: List of package metadata.
     """
-    service_index = get_nuget_service_index()
-    search_url = find_resource_url(service_index, "SearchQueryService")
+    url = _search_template().format(q=quote_plus(query, safe=""), take=take, skip=skip)
 
-    params = {"q": query, "take": take, "skip": skip}
-    url = f"{search_url}?{urlencode(params)}"
-
-    response = requests.get(url)
-    response.raise_for_status()
-    data = response.json()
+    # Search results are live; cache only for cheap 304 revalidation.
+    data = _get_json(url, max_age=0)
     return data["data"]
 
 
+def _lc(s):
+    """
+    Canonical form of a package id or version: interned and lowercase, as used
+    in registration URLs, memoization keys and `visited` sets. Each distinct
+    string is lowered once.
+    """
+    lowered = _lower_cache.get(s)
+    if lowered is None:
+        lowered = _lower_cache[s] = sys.intern(s.lower())
+    return lowered
+
+
 def get_package_versions(package_id):
     """
     Get all versions of a specific package using the RegistrationsBaseUrl.
 
     :param package_id: The ID of the package (case-insensitive).
-    :return: List of versions.
+    :return: List of versions, newest first.
+    """
+    return sorted(
+        _fetch_package_versions(_lc(package_id)), key=version_to_key, reverse=True
+    )
+
+
+def _latest_version(package_id):
+    """
+    Newest version of a package, or None if it has none; a single O(n) pass
+    instead of sorting every version when only the first would be used.
+    """
+    versions = _fetch_package_versions(_lc(package_id))
+    return max(versions, key=version_to_key) if versions else None
+
+
+@functools.lru_cache(maxsize=4096)
+def _fetch_package_versions(package_id_lower):
+    """
+    Memoized fetch of a package's distinct versions (unordered), keyed by the
+    canonical id.
+    """
+    leaves = _version_catalog_map(package_id_lower).values()
+    return tuple(leaf.version for leaf in leaves)
+
+
+def _version_catalog_map(package_id_lower):
+    """
+    Walk a package's registration index once and map each lowercased version
+    to a _Leaf. A failed index or page fetch raises and stores nothing.
+
+    The version list, the dependency lookup and its 404 fallback all read this
+    map, so the index and its pages are fetched at most once per package, and
+    versions whose catalog entry is inlined need no request of their own.
     """
-    service_index = get_nuget_service_index()
-    registrations_url = find_resource_url(service_index, "RegistrationsBaseUrl")
+    leaves = _peek_catalog_map(package_id_lower)
+    if leaves is not None:
+        return leaves
+
+    registrations_url = _resource_url("RegistrationsBaseUrl")
 
-    package_id_lower = package_id.lower()
     index_url = f"{registrations_url}{package_id_lower}/index.json"
 
-    response = requests.get(index_url)
-    response.raise_for_status()
-    index_data = response.json()
+    index_data = _get_json(index_url)
 
-    versions = []
+    leaves = {}
     pages = index_data.get("items", [])
 
+    # Small registrations inline every page, so no further request is needed.
+    # Larger ones only link their pages; those are fetched concurrently, and
+    # each worker reduces its page to _Leaf tuples before returning so the
+    # parsed page documents are freed as soon as they are read.
+    deferred_urls = []
     for page in pages:
         page_items = page.get("items")
-        if not page_items:
-            try:
-                page_response = requests.get(page["@id"])
-                page_response.raise_for_status()
-                page_data = page_response.json()
-                page_items = page_data.get("items", [])
-            except requests.RequestException:
-                continue
+        if page_items:
+            leaves.update(_entry_leaves(page_items))
+        else:
+            deferred_urls.append(page["@id"])
+
+    for page_leaves in _PAGE_EXECUTOR.map(_fetch_page_leaves, deferred_urls):
+        leaves.update(page_leaves)
+
+    with _catalog_maps_lock:
+        _catalog_maps[package_id_lower] = leaves
+        if len(_catalog_maps) > CATALOG_MAP_CACHE_SIZE:
+            _catalog_maps.popitem(last=False)
+    return leaves
+
+
+def _peek_catalog_map(package_id_lower):
+    """
+    Return a package's version map if it is already in memory, else None;
+    never fetches.
+    """
+    with _catalog_maps_lock:
+        leaves = _catalog_maps.get(package_id_lower)
+        if leaves is not None:
+            _catalog_maps.move_to_end(package_id_lower)
+        return leaves
+
+
+def _entry_leaves(page_items):
+    """
+    Extract {version_lower: _Leaf} from the items of a registration page.
+    """
+    leaves = {}
+    for entry in page_items:
+        catalog_entry = entry.get("catalogEntry")
+        dependencies = None
+        if isinstance(catalog_entry, dict):
+            version = catalog_entry.get("version")
+            catalog_url = catalog_entry.get("@id")
+            # An inlined entry is the full catalog entry: NuGet omits
+            # dependencyGroups for packages without dependencies.
+            dependencies = _parse_dependency_groups(catalog_entry)
+        else:
+            version = entry.get("version")
+            catalog_url = catalog_entry
+        if version:
+            leaves[sys.intern(version.lower())] = _Leaf(
+                version, catalog_url, dependencies
+            )
+    return leaves
 
-        for entry in page_items:
-            catalog_entry = entry.get("catalogEntry")
-            if isinstance(catalog_entry, dict):
-                version = catalog_entry.get("version")
-                if version:
-                    versions.append(version)
-            elif "version" in entry:
-                versions.append(entry["version"])
 
-    return sorted(list(set(versions)), key=version_to_key, reverse=True)
+def _fetch_page_leaves(page_url):
+    """
+    Fetch a registration page and return only its version map. Errors
+    propagate, so a map missing a page is never memoized.
+    """
+    return _entry_leaves(_get_json(page_url).get("items", []))
 
 
 def get_package_dependencies(package_id, version):
@@ -95,61 +424,73 @@ def get_package_dependencies(package_id, version):
 
     :param package_id: The ID of the package (case-insensitive).
     :param version: The version of the package (case-insensitive).
-    :return: List of dependencies, each as a dict with 'framework', 'id', and 'range'.
+    :return: List of dependencies, each a Dep(framework, id, range) named tuple.
+    """
+    try:
+        # The memoized result is a shared tuple; callers get their own list.
+        return list(_fetch_package_dependencies(_lc(package_id), _lc(version)))
+    except (urllib3.exceptions.HTTPError, ValueError) as e:
+        logger.error(
+            "  [Error] Не удалось получить зависимости для %s %s: %s",
+            package_id,
+            version,
+            e,
+        )
+        return []
+
+
+@functools.lru_cache(maxsize=4096)
+def _fetch_package_dependencies(package_id_lower, version_lower):
     """
-    service_index = get_nuget_service_index()
-    registrations_url = find_resource_url(service_index, "RegistrationsBaseUrl")
+    Memoized body of get_package_dependencies, keyed by the canonical (id, version).
+    Failed fetches raise and are therefore not cached.
+    """
+    # The graph walk has usually read this package's index already to pick the
+    # version; then inlined dependencies are a dict lookup away. A standalone
+    # lookup goes to the leaf instead of downloading every registration page.
+    catalog_map = _peek_catalog_map(package_id_lower)
+    leaf = catalog_map.get(version_lower) if catalog_map is not None else None
+    if leaf is not None and leaf.dependencies is not None:
+        return leaf.dependencies
+
+    registrations_url = _resource_url("RegistrationsBaseUrl")
 
-    package_id_lower = package_id.lower()
-    version_lower = version.lower()  # Versions are normalized to lowercase in URLs
     leaf_url = f"{registrations_url}{package_id_lower}/{version_lower}.json"
 
     try:
-        response = requests.get(leaf_url)
-        if response.status_code == 404:
-            index_url = f"{registrations_url}{package_id_lower}/index.json"
-            idx_resp = requests.get(index_url)
-            idx_resp.raise_for_status()
-            idx_data = idx_resp.json()
-            for page in idx_data.get("items", []):
-                for item in page.get("items", []):
-                    if (
-                        item.get("catalogEntry", {}).get("version", "").lower()
-                        == version_lower
-                    ):
-                        catalog_url = item.get("catalogEntry", {}).get("@id")
-                        if catalog_url:
-                            response = requests.get(catalog_url)
-                            break
-                if response.status_code == 200:
-                    break
-            if response.status_code == 404:
-                response.raise_for_status()
-
-        response.raise_for_status()
-        data = response.json()
-
-        if "dependencyGroups" in data:
-            catalog_entry = data
-        elif "catalogEntry" in data:
-            catalog_entry_url_or_data = data.get("catalogEntry")
-            if isinstance(catalog_entry_url_or_data, str):
-                catalog_response = requests.get(catalog_entry_url_or_data)
-                catalog_response.raise_for_status()
-                catalog_entry = catalog_response.json()
-            elif isinstance(catalog_entry_url_or_data, dict):
-                catalog_entry = catalog_entry_url_or_data
-            else:
-                raise ValueError("Unexpected type for catalogEntry")
+        data = _get_json(leaf_url, max_age=NEVER_EXPIRES)
+    except HTTPStatusError as e:
+        if e.status != 404:
+            raise
+        if leaf is None:
+            leaf = _version_catalog_map(package_id_lower).get(version_lower)
+        if leaf is not None and leaf.dependencies is not None:
+            return leaf.dependencies
+        if leaf is None or not leaf.catalog_url:
+            raise
+        data = _get_json(leaf.catalog_url, max_age=NEVER_EXPIRES)
+
+    if "dependencyGroups" in data:
+        catalog_entry = data
+    elif "catalogEntry" in data:
+        catalog_entry_url_or_data = data.get("catalogEntry")
+        if isinstance(catalog_entry_url_or_data, str):
+            catalog_entry = _get_json(catalog_entry_url_or_data, max_age=NEVER_EXPIRES)
+        elif isinstance(catalog_entry_url_or_data, dict):
+            catalog_entry = catalog_entry_url_or_data
         else:
-            catalog_entry = {}
+            raise ValueError("Unexpected type for catalogEntry")
+    else:
+        catalog_entry = {}
+
+    return _parse_dependency_groups(catalog_entry)
 
-    except requests.RequestException as e:
-        print(
-            f"  [Error] Не удалось получить зависимости для {package_id} {version}: {e}"
-        )
-        return []
 
+def _parse_dependency_groups(catalog_entry):
+    """
+    Flatten the dependencyGroups of a catalog entry into a tuple of Dep; it is
+    stored in the memoized maps, so it must not be mutable.
+    """
     dependency_groups = catalog_entry.get("dependencyGroups", [])
 
     dependencies = []
@@ -161,12 +502,11 @@ def get_package_dependencies(package_id, version):
             if not dep_id:
                 continue
             dep_range = dep.get("range", "*")
-            dependencies.append(
-                {"framework": target_framework, "id": dep_id, "range": dep_range}
-            )
-    return dependencies
+            dependencies.append(Dep(target_framework, dep_id, dep_range))
+    return tuple(dependencies)
 
 
+@functools.lru_cache(maxsize=8192)
 def version_to_key(v):
     """
     Convert a version string to a sortable key, handling semantic versioning.
@@ -174,7 +514,7 @@ def version_to_key(v):
     if v is None:
         return ((), (0,), ())
     v = v.lower().strip()
-    match = re.match(r"^(\d+(?:\.\d+)*)(?:-([^+]+))?(?:\+(.*))?$", v)
+    match = _VERSION_RE.match(v)
     if not match:
         return ((), (0,), ())
     core_str, pre_str, build_str = match.groups()
@@ -182,7 +522,7 @@ def version_to_key(v):
     if pre_str:
         pre_parts = []
         for p in pre_str.split("."):
-            if p.isdigit():
+            if p.isdecimal():
                 pre_parts.append((0, int(p)))
             else:
                 pre_parts.append((1, p))
@@ -197,7 +537,8 @@ def build_dependency_graph_dfs(
     start_package, start_version, framework=None, exclude_substring=None
 ):
     """
-    Построение графа зависимостей с использованием нерекурсивного DFS (обход в глубину).
+    Построение графа зависимостей послойным обходом: все запросы одного уровня
+    глубины выполняются параллельно. Имя сохранено для совместимости.
 
     :param start_package: Корневой пакет.
     :param start_version: Версия корневого пакета.
@@ -206,74 +547,99 @@ def build_dependency_graph_dfs(
     :return: Словарь (граф), представляющий список смежности.
     """
 
-    print(f"Начало построения графа для: {start_package} v{start_version}")
+    logger.info("Начало построения графа для: %s v%s", start_package, start_version)
 
     if exclude_substring:
         exclude_substring = exclude_substring.lower()
-        print(f"Исключаем пакеты, содержащие: '{exclude_substring}'")
+        logger.info("Исключаем пакеты, содержащие: '%s'", exclude_substring)
 
-        if exclude_substring in start_package.lower():
-            print(f"Корневой пакет {start_package} исключен из анализа.")
+        if exclude_substring in _lc(start_package):
+            logger.info("Корневой пакет %s исключен из анализа.", start_package)
             return {}
 
-    stack = deque([(start_package, start_version)])
+    # Frameworks a dependency group may target to be followed; None keeps all.
+    accepted_frameworks = {_lc(framework), "any"} if framework else None
+
+    # The walk goes layer by layer: every fetch for one depth is in flight at
+    # once, and results are handled in the layer's order so output stays
+    # deterministic.
+    layer = [(start_package, start_version)]
 
     graph = {}
 
-    visited = set()
+    # Ids are marked visited when first queued, so a package reached through
+    # several edges is resolved once and never re-queued by a later layer.
+    visited = {_lc(start_package)}
 
-    while stack:
-        try:
-            current_id, current_version = stack.pop()
-            current_id_lower = current_id.lower()
+    while layer:
+        dep_futures = [
+            _EXECUTOR.submit(get_package_dependencies, node_id, node_version)
+            for node_id, node_version in layer
+        ]
 
-            if current_id_lower in visited:
-                continue
+        to_resolve = []
+        for (current_id, current_version), future in zip(layer, dep_futures):
+            try:
+                if current_id not in graph:
+                    graph[current_id] = set()
 
-            visited.add(current_id_lower)
+                logger.debug("  Анализ: %s v%s", current_id, current_version)
 
-            if current_id not in graph:
-                graph[current_id] = set()
+                direct_deps = future.result()
 
-            print(f"  Анализ: {current_id} v{current_version}")
+                if accepted_frameworks is None:
+                    deps_to_process = direct_deps
+                else:
+                    deps_to_process = [
+                        d
+                        for d in direct_deps
+                        if _lc(d.framework) in accepted_frameworks
+                    ]
 
-            direct_deps = get_package_dependencies(current_id, current_version)
+                for dep in deps_to_process:
+                    dep_id = dep.id
+                    dep_id_lower = _lc(dep_id)
 
-            if framework:
-                deps_to_process = [
-                    d
-                    for d in direct_deps
-                    if d["framework"].lower() == framework.lower()
-                    or d["framework"] == "Any"
-                ]
-            else:
-                deps_to_process = direct_deps
+                    if exclude_substring and exclude_substring in dep_id_lower:
+                        logger.debug("    -> Пропуск (фильтр): %s", dep_id)
+                        continue
 
-            for dep in deps_to_process:
-                dep_id = dep["id"]
-                dep_id_lower = dep_id.lower()
+                    graph[current_id].add(dep_id)
 
-                if exclude_substring and exclude_substring in dep_id_lower:
-                    print(f"    -> Пропуск (фильтр): {dep_id}")
-                    continue
+                    if dep_id_lower not in visited:
+                        visited.add(dep_id_lower)
+                        to_resolve.append(dep_id)
 
-                graph[current_id].add(dep_id)
+            except urllib3.exceptions.HTTPError as e:
+                logger.error("  [Error] Ошибка при обработке %s: %s", current_id, e)
+            except Exception as e:
+                logger.error(
+                    "  [Fatal Error] Непредвиденная ошибка с %s: %s", current_id, e
+                )
 
-                if dep_id_lower not in visited:
-                    versions = get_package_versions(dep_id)
-                    if not versions:
-                        print(f"    -> {dep_id} (версии не найдены)")
-                        continue
+        # Latest versions of the whole next layer are resolved concurrently too.
+        version_futures = [
+            _EXECUTOR.submit(_latest_version, dep_id) for dep_id in to_resolve
+        ]
+
+        layer = []
+        for dep_id, future in zip(to_resolve, version_futures):
+            try:
+                latest_ver = future.result()
+                if latest_ver is None:
+                    logger.debug("    -> %s (версии не найдены)", dep_id)
+                    continue
 
-                    latest_ver = versions[0]
-                    stack.append((dep_id, latest_ver))
+                layer.append((dep_id, latest_ver))
 
-        except requests.RequestException as e:
-            print(f"  [Error] Ошибка при обработке {current_id}: {e}")
-        except Exception as e:
-            print(f"  [Fatal Error] Непредвиденная ошибка с {current_id}: {e}")
+            except (urllib3.exceptions.HTTPError, ValueError) as e:
+                logger.error("  [Error] Ошибка при обработке %s: %s", dep_id, e)
+            except Exception as e:
+                logger.error(
+                    "  [Fatal Error] Непредвиденная ошибка с %s: %s", dep_id, e
+                )
 
-    print("Построение графа завершено.")
+    logger.info("Построение графа завершено.")
     return graph
 
 
@@ -296,13 +662,13 @@ def get_reverse_dependencies(package_id, skip=0, take=100):
     url = f"https://api.nuget.org/v3/dependents?{urlencode(params)}"
 
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = _get_json(url)
         return data.get("data", [])
-    except requests.RequestException as e:
-        print(
-            f"  [Error] Не удалось получить обратные зависимости для {package_id}: {e}"
+    except (urllib3.exceptions.HTTPError, ValueError) as e:
+        logger.error(
+            "  [Error] Не удалось получить обратные зависимости для %s: %s",
+            package_id,
+            e,
         )
         return []
 
@@ -311,7 +677,7 @@ def build_reverse_dependency_graph_dfs(
     start_package, exclude_substring=None, max_dependents_per_package=100
 ):
     """
-    Построение графа обратных зависимостей с использованием нерекурсивного DFS (обход в глубину).
+    Построение графа обратных зависимостей послойным обходом с параллельными запросами.
     Граф представляет пакеты, которые зависят от данного (dependents).
 
     :param start_package: Корневой пакет.
@@ -320,60 +686,70 @@ def build_reverse_dependency_graph_dfs(
     :return: Словарь (граф), где ключ - пакет, значение - set dependents.
     """
 
-    print(f"Начало построения графа обратных зависимостей для: {start_package}")
+    logger.info("Начало построения графа обратных зависимостей для: %s", start_package)
 
     if exclude_substring:
         exclude_substring = exclude_substring.lower()
-        print(f"Исключаем пакеты, содержащие: '{exclude_substring}'")
+        logger.info("Исключаем пакеты, содержащие: '%s'", exclude_substring)
 
-        if exclude_substring in start_package.lower():
-            print(f"Корневой пакет {start_package} исключен из анализа.")
+        if exclude_substring in _lc(start_package):
+            logger.info("Корневой пакет %s исключен из анализа.", start_package)
             return {}
 
-    stack = deque([start_package])
+    # Same layered walk as build_dependency_graph_dfs: all dependents lookups
+    # of one depth run concurrently, results are handled in layer order.
+    layer = {_lc(start_package): start_package}
 
     graph = {}
 
-    visited = set()
-
-    while stack:
-        try:
-            current_id = stack.pop()
-            current_id_lower = current_id.lower()
-
-            if current_id_lower in visited:
-                continue
+    # Marked when queued, as in build_dependency_graph_dfs.
+    visited = set(layer)
+
+    while layer:
+        # Получаем только первые max_dependents_per_package (без пагинации дальше, чтобы избежать перегрузки)
+        dependents_futures = [
+            _EXECUTOR.submit(
+                get_reverse_dependencies,
+                node_id,
+                skip=0,
+                take=max_dependents_per_package,
+            )
+            for node_id in layer.values()
+        ]
 
-            visited.add(current_id_lower)
+        next_layer = {}
+        for current_id, future in zip(layer.values(), dependents_futures):
+            try:
+                if current_id not in graph:
+                    graph[current_id] = set()
 
-            if current_id not in graph:
-                graph[current_id] = set()
+                logger.debug("  Анализ обратных зависимостей: %s", current_id)
 
-            print(f"  Анализ обратных зависимостей: {current_id}")
+                direct_dependents = future.result()
 
-            # Получаем только первые max_dependents_per_package (без пагинации дальше, чтобы избежать перегрузки)
-            direct_dependents = get_reverse_dependencies(
-                current_id, skip=0, take=max_dependents_per_package
-            )
+                for dep_id in direct_dependents:
+                    dep_id_lower = _lc(dep_id)
 
-            for dep_id in direct_dependents:
-                dep_id_lower = dep_id.lower()
+                    if exclude_substring and exclude_substring in dep_id_lower:
+                        logger.debug("    -> Пропуск (фильтр): %s", dep_id)
+                        continue
 
-                if exclude_substring and exclude_substring in dep_id_lower:
-                    print(f"    -> Пропуск (фильтр): {dep_id}")
-                    continue
+                    graph[current_id].add(dep_id)
 
-                graph[current_id].add(dep_id)
+                    if dep_id_lower not in visited:
+                        visited.add(dep_id_lower)
+                        next_layer[dep_id_lower] = dep_id
 
-                if dep_id_lower not in visited:
-                    stack.append(dep_id)
+            except urllib3.exceptions.HTTPError as e:
+                logger.error("  [Error] Ошибка при обработке %s: %s", current_id, e)
+            except Exception as e:
+                logger.error(
+                    "  [Fatal Error] Непредвиденная ошибка с %s: %s", current_id, e
+                )
 
-        except requests.RequestException as e:
-            print(f"  [Error] Ошибка при обработке {current_id}: {e}")
-        except Exception as e:
-            print(f"  [Fatal Error] Непредвиденная ошибка с {current_id}: {e}")
+        layer = next_layer
 
-    print("Построение графа обратных зависимостей завершено.")
+    logger.info("Построение графа обратных зависимостей завершено.")
     return graph
 
 
@@ -401,6 +777,9 @@ if __name__ == "__main__":
     FRAMEWORK_FILTER = None
     EXCLUDE_FILTER = None
 
+    # Прогресс обхода выводится через logging; DEBUG покажет каждый узел.
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print(f"Ищем последнюю версию для {START_PACKAGE}...")
     try:
         versions = get_package_versions(START_PACKAGE)
@@ -438,7 +817,7 @@ if __name__ == "__main__":
         )
         print_graph(reverse_dependency_graph)
 
-    except requests.RequestException as e:
+    except urllib3.exceptions.HTTPError as e:
         print(f"\nОшибка API: {e}")
     except ValueError as e:
         print(f"\nОшибка данных: {e}")